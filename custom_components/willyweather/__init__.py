@@ -1 +1,85 @@
 """The willyweather component."""
+import logging
+from datetime import timedelta
+
+import requests
+
+from homeassistant.util import Throttle
+
+_RESOURCE = 'https://api.willyweather.com.au/v2/{}/locations/{}/weather.json?observational=true'
+_FORECAST_URL = _RESOURCE + '&forecasts=weather,rainfall&days={}'
+_CLOSEST = 'https://api.willyweather.com.au/v2/{}/search.json'
+_LOGGER = logging.getLogger(__name__)
+
+# Shared by both platforms so calls to the API reuse pooled connections
+SESSION = requests.Session()
+
+# Closest station by (lat, lng, api_key); 3 decimals is ~100 m
+_STATION_IDS = {}
+
+MIN_TIME_BETWEEN_UPDATES = timedelta(minutes=30)
+
+
+def get_station_id(lat, lng, api_key):
+    """Return the id of the WillyWeather location closest to lat/lng."""
+    if lat is None or lng is None or (lat == 0 and lng == 0):
+        _LOGGER.error("Home Assistant location is not set, can't find closest station")
+        return None
+
+    cache_key = (round(lat, 3), round(lng, 3), api_key)
+    if cache_key in _STATION_IDS:
+        return _STATION_IDS[cache_key]
+
+    closestURL = _CLOSEST.format(api_key)
+    closestURLParams = [
+        ("lat", lat),
+        ("lng", lng),
+        ("units", "distance:km")
+    ]
+
+    try:
+        resp = SESSION.get(closestURL, params=closestURLParams, timeout=10).json()
+        if resp is None:
+            return
+
+        station_id = resp['location']['id']
+        _STATION_IDS[cache_key] = station_id
+        return station_id
+
+    except ValueError as err:
+        _LOGGER.error("*** Error finding closest station")
+
+
+class WeatherData:
+    """Handle WillyWeather API object and limit updates."""
+
+    def __init__(self, api_key, station_id, days=None):
+        """Initialize the data object."""
+        self._api_key = api_key
+        self._station_id = station_id
+        self._days = days
+        self._url = self._build_url()
+        self._data = None
+
+    def _build_url(self):
+        """Build the URL for the requests."""
+        if self._days:
+            url = _FORECAST_URL.format(self._api_key, self._station_id, self._days)
+        else:
+            url = _RESOURCE.format(self._api_key, self._station_id)
+        _LOGGER.debug("WillyWeather URL: %s", url)
+        return url
+
+    @property
+    def latest_data(self):
+        """Return the latest data object."""
+        if self._data:
+            return self._data
+        return None
+
+    @Throttle(MIN_TIME_BETWEEN_UPDATES)
+    def update(self):
+        """Get the latest data from WillyWeather."""
+        result = SESSION.get(self._url, timeout=10).json()
+        self._data = result
+        return
@@ -1,8 +1,7 @@
 """Support for the WillyWeather Australia service."""
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 
-import requests
 import voluptuous as vol
 
 import homeassistant.helpers.config_validation as cv
@@ -10,9 +9,9 @@ from homeassistant.components.weather import (
     ATTR_FORECAST_CONDITION, ATTR_FORECAST_NATIVE_TEMP, ATTR_FORECAST_NATIVE_TEMP_LOW, ATTR_FORECAST_NATIVE_PRECIPITATION,
     ATTR_FORECAST_PRECIPITATION_PROBABILITY, ATTR_FORECAST_TIME, PLATFORM_SCHEMA, WeatherEntity)
 from homeassistant.const import (TEMP_CELSIUS, CONF_NAME, STATE_UNKNOWN)
-from homeassistant.util import Throttle
-_RESOURCE = 'https://api.willyweather.com.au/v2/{}/locations/{}/weather.json?observational=true&forecasts=weather,rainfall&days={}'
-_CLOSEST =  'https://api.willyweather.com.au/v2/{}/search.json'
+
+from . import WeatherData, get_station_id
+
 _LOGGER = logging.getLogger(__name__)
 
 ATTRIBUTION = "Data provided by WillyWeather"
@@ -23,8 +22,6 @@ CONF_API_KEY = 'api_key'
 
 DEFAULT_NAME = 'WW'
 
-MIN_TIME_BETWEEN_UPDATES = timedelta(minutes=30)
-
 MAP_CONDITION = {
 'fine' : 'sunny',
 'mostly-fine' : 'sunny',
@@ -59,7 +56,7 @@ MAP_CONDITION = {
 
 def validate_days(days):
     """Check that days is within bounds."""
-    if days not in range(1,7):
+    if not (isinstance(days, int) and 1 <= days <= 6):
         raise vol.error.Invalid("Days is out of Range")
     return days
     
@@ -103,8 +100,11 @@ class WWWeatherForecast(WeatherEntity):
     def __init__(self, weather_data, name, unit):
         """Initialize the component."""
         self._name = name
+        self._unique_id = f"{name} weather"
         self._data = weather_data
         self._unit = unit
+        self._forecast = None
+        self._forecast_source = None
 
     @property
     def name(self):
@@ -116,7 +116,12 @@ class WWWeatherForecast(WeatherEntity):
     @property
     def unique_id(self):
         """Return the sensor unique id."""
-        return f"{self._name} weather"
+        return self._unique_id
+
+    @property
+    def available(self):
+        """Return if weather data is available from WillyWeather."""
+        return self._data.latest_data is not None
 
     @property
     def condition(self):
@@ -161,18 +166,26 @@ class WWWeatherForecast(WeatherEntity):
     @property
     def forecast(self):
         """Return the forecast array."""
+        return self._forecast
+
+    def _build_forecast(self):
+        """Build the forecast array from the latest data."""
         try:
+            forecasts = self._data.latest_data['forecasts']
+            rain_days = forecasts["rainfall"]["days"]
 
             forecast_data = []
-            for  num, v in enumerate(self._data.latest_data['forecasts']["weather"]["days"]):
-                date_string = datetime.strptime(v['entries'][0]['dateTime'], "%Y-%m-%d %H:%M:%S").strftime("%Y-%m-%dT%H:%M:%S")
+            for num, v in enumerate(forecasts["weather"]["days"]):
+                entry = v['entries'][0]
+                rain = rain_days[num]['entries'][0]
+                date_string = datetime.fromisoformat(entry['dateTime']).isoformat()
                 data_dict = {
                     ATTR_FORECAST_TIME: date_string,
-                    ATTR_FORECAST_NATIVE_TEMP: v['entries'][0]['max'],
-                    ATTR_FORECAST_NATIVE_TEMP_LOW: v['entries'][0]['min'],
-                    ATTR_FORECAST_NATIVE_PRECIPITATION: self._data.latest_data['forecasts']["rainfall"]["days"][num]['entries'][0]['endRange'],
-                    ATTR_FORECAST_PRECIPITATION_PROBABILITY: self._data.latest_data['forecasts']["rainfall"]["days"][num]['entries'][0]['probability'],
-                    ATTR_FORECAST_CONDITION: MAP_CONDITION.get(v['entries'][0]['precisCode'])
+                    ATTR_FORECAST_NATIVE_TEMP: entry['max'],
+                    ATTR_FORECAST_NATIVE_TEMP_LOW: entry['min'],
+                    ATTR_FORECAST_NATIVE_PRECIPITATION: rain['endRange'],
+                    ATTR_FORECAST_PRECIPITATION_PROBABILITY: rain['probability'],
+                    ATTR_FORECAST_CONDITION: MAP_CONDITION.get(entry['precisCode'])
                 }
                 forecast_data.append(data_dict)
             return forecast_data
@@ -187,50 +200,8 @@ class WWWeatherForecast(WeatherEntity):
             _LOGGER.info("Didn't receive weather data from WillyWeather")
             return
 
-class WeatherData:
-    """Handle WillyWeather API object and limit updates."""
-
-    def __init__(self, api_key, station_id, days):
-        """Initialize the data object."""
-        self._api_key = api_key
-        self._station_id = station_id
-        self._days = days
-
-    def _build_url(self):
-        """Build the URL for the requests."""
-        url = _RESOURCE.format(self._api_key, self._station_id, self._days)
-        _LOGGER.debug("WillyWeather URL: %s", url)
-        return url
-
-    @property
-    def latest_data(self):
-        """Return the latest data object."""
-        if self._data:
-            return self._data
-        return None
-
-    @Throttle(MIN_TIME_BETWEEN_UPDATES)
-    def update(self):
-        """Get the latest data from WillyWeather."""
-        result = requests.get(self._build_url(), timeout=10).json()
-        self._data = result
-        return
-
-def get_station_id(lat, lng, api_key):
-
-    closestURL = _CLOSEST.format(api_key)
-    closestURLParams = [
-        ("lat", lat),
-        ("lng", lng),
-        ("units", "distance:km")
-    ]
-
-    try:
-        resp = requests.get(closestURL, params=closestURLParams, timeout=10).json()
-        if resp is None:
-            return
-
-        return resp['location']['id']
-
-    except ValueError as err:
-        _LOGGER.error("*** Error finding closest station")
+        # Only rebuild when the throttled fetch has returned new data
+        latest = self._data.latest_data
+        if latest is not self._forecast_source:
+            self._forecast = self._build_forecast()
+            self._forecast_source = latest